@@ -1,67 +1,97 @@
 #!/usr/bin/env python3
 
-import json
+import bisect
+import os
+import sys
 
-# Load current config
-with open('config.json', 'r') as f:
-    config = json.load(f)
+try:
+    import orjson
+except ImportError:
+    import json as orjson
 
-print("=== Current Configuration Analysis ===\n")
+
+def channels_in_range(sorted_channels, lower, upper):
+    """Return the channels in [lower, upper] from an ascending list."""
+    lo = bisect.bisect_left(sorted_channels, lower)
+    hi = bisect.bisect_right(sorted_channels, upper)
+    return sorted_channels[lo:hi]
+
+
+_hz_strings = {}
+
+
+def format_hz(freq):
+    """Return (thousands-separated Hz, MHz to 3 places) strings, cached per frequency."""
+    strings = _hz_strings.get(freq)
+    if strings is None:
+        strings = _hz_strings[freq] = (f"{freq:,}", f"{freq / 1000000:.3f}")
+    return strings
+
+
+# Load current config with a single read of the whole file
+fd = os.open('config.json', os.O_RDONLY)
+try:
+    config = orjson.loads(os.read(fd, os.fstat(fd).st_size))
+finally:
+    os.close(fd)
+
+out = ["=== Current Configuration Analysis ===\n"]
+emit = out.append
 
 # Extract data
 sources = config['sources']
 control_channels = config['systems'][0]['control_channels']
+cc_sorted = sorted(control_channels)
 
-print(f"Control Channels: {len(control_channels)}")
+# Split the source dicts into per-field columns once
+centers = [source['center'] for source in sources]
+rates = [source['rate'] for source in sources]
+recorder_counts = [source['digitalRecorders'] for source in sources]
+
+emit(f"Control Channels: {len(control_channels)}")
 for i, cc in enumerate(control_channels):
-    print(f"  {i+1}. {cc:,} Hz ({cc/1000000:.3f} MHz)")
+    cc_hz, cc_mhz = format_hz(cc)
+    emit(f"  {i+1}. {cc_hz} Hz ({cc_mhz} MHz)")
 
-print(f"\nRTL-SDR Sources: {len(sources)}")
-total_recorders = 0
+emit(f"\nRTL-SDR Sources: {len(sources)}")
+total_recorders = sum(recorder_counts)
+per_source = []
 
-for i, source in enumerate(sources):
-    center = source['center']
-    bandwidth = source['rate']
-    recorders = source['digitalRecorders']
-    total_recorders += recorders
-    
+for i, (center, bandwidth, recorders) in enumerate(zip(centers, rates, recorder_counts)):
     # Calculate frequency range this RTL-SDR covers
     lower = center - (bandwidth // 2)
     upper = center + (bandwidth // 2)
     
     # Count control channels in this range
-    controls_in_range = [cc for cc in control_channels if lower <= cc <= upper]
+    controls_in_range = channels_in_range(cc_sorted, lower, upper)
+    per_source.append((center, bandwidth, lower, upper, controls_in_range, recorders))
     
-    print(f"\n  RTL-SDR {i} (rtl={i}):")
-    print(f"    Center: {center:,} Hz ({center/1000000:.3f} MHz)")
-    print(f"    Range: {lower:,} - {upper:,} Hz ({lower/1000000:.3f} - {upper/1000000:.3f} MHz)")
-    print(f"    Bandwidth: {bandwidth/1000000:.1f} MHz")
-    print(f"    Digital Recorders: {recorders}")
-    print(f"    Control Channels in range: {len(controls_in_range)}")
+    emit(f"\n  RTL-SDR {i} (rtl={i}):")
+    emit(f"    Center: {center:,} Hz ({center/1000000:.3f} MHz)")
+    emit(f"    Range: {lower:,} - {upper:,} Hz ({lower/1000000:.3f} - {upper/1000000:.3f} MHz)")
+    emit(f"    Bandwidth: {bandwidth/1000000:.1f} MHz")
+    emit(f"    Digital Recorders: {recorders}")
+    emit(f"    Control Channels in range: {len(controls_in_range)}")
     for cc in controls_in_range:
-        print(f"      - {cc:,} Hz ({cc/1000000:.3f} MHz)")
+        cc_hz, cc_mhz = format_hz(cc)
+        emit(f"      - {cc_hz} Hz ({cc_mhz} MHz)")
 
-print(f"\nTotal Digital Recorders: {total_recorders}")
+emit(f"\nTotal Digital Recorders: {total_recorders}")
 
 # Show the new calculation method
-print("\n=== New Calculation Method ===")
-print("Target: 22 total recorders distributed evenly")
-print("Base per device: 22 ÷ 3 = 7 recorders each")
-print("Remainder: 22 % 3 = 1 extra recorder")
-print("Control channel bonus: +1-2 for devices with control channels")
-
-print("\nRecommended distribution:")
-for i, source in enumerate(sources):
-    center = source['center']
-    bandwidth = source['rate']
-    lower = center - (bandwidth // 2)
-    upper = center + (bandwidth // 2)
-    controls_in_range = [cc for cc in control_channels if lower <= cc <= upper]
-    
+emit("\n=== New Calculation Method ===")
+emit("Target: 22 total recorders distributed evenly")
+emit("Base per device: 22 ÷ 3 = 7 recorders each")
+emit("Remainder: 22 % 3 = 1 extra recorder")
+emit("Control channel bonus: +1-2 for devices with control channels")
+
+emit("\nRecommended distribution:")
+for i, (center, bandwidth, lower, upper, controls_in_range, recorders) in enumerate(per_source):
     # Apply new calculation
     base = 7  # 22 // 3
-    if len(controls_in_range) > 0:
-        recommended = base + min(2, len(controls_in_range))
+    control_bonus = min(2, len(controls_in_range))
+    if control_bonus > 0:
+        recommended = base + control_bonus
     else:
         recommended = base
     
@@ -70,7 +100,9 @@ for i, source in enumerate(sources):
         recommended += 1  # 22 % 3 = 1
     
     # Apply limits
-    recommended = max(6, min(10, recommended))
+    recommended = 6 if recommended < 6 else 10 if recommended > 10 else recommended
     
-    print(f"  RTL-SDR {i}: {recommended} recorders (was {source['digitalRecorders']})")
-    print(f"    Base: 7, Control bonus: {min(2, len(controls_in_range))}, Remainder: {1 if i == 0 else 0}")
\ No newline at end of file
+    emit(f"  RTL-SDR {i}: {recommended} recorders (was {recorders})")
+    emit(f"    Base: 7, Control bonus: {control_bonus}, Remainder: {1 if i == 0 else 0}")
+
+sys.stdout.write("\n".join(out) + "\n")
@@ -17,16 +17,106 @@ Author: Amazon Q
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import csv
+import io
 import json
+import os
 import sys
 import argparse
-from bs4 import BeautifulSoup
+import hashlib
+import html
+import re
+import threading
+from urllib.parse import urlsplit
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
 
-def calculate_recorders(device_index, center_freq, bandwidth, all_frequencies, control_channels, total_devices=3):
+# orjson is optional; fall back to the standard library json module
+try:
+    import orjson
+    
+    def json_loads(data):
+        return orjson.loads(data)
+    
+    def json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def json_loads(data):
+        return json.loads(data)
+    
+    def json_dumps(obj):
+        return (json.dumps(obj, indent=2) + '\n').encode('utf-8')
+
+# Prefer the C-based lxml parser for RadioReference pages when it is installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# One row of the RadioReference sites CSV, keeping only the columns used later
+# (info: additional columns 4-8 shown in site selection, freqs: frequency cells from column 9 on)
+Site = namedtuple('Site', ['dec', 'description', 'nac', 'info', 'freqs'])
+
+# Characters that make csv.writer quote a field
+CSV_QUOTE_RE = re.compile(r'[,"\r\n]')
+
+# Page title of a RadioReference system page, matched on the raw bytes
+TITLE_RE = re.compile(rb'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+
+# Elements whose text is never location information
+HIDDEN_TEXT_TAGS = ('title', 'script', 'style')
+
+# An element holding only text that mentions a county, matched on the raw bytes
+COUNTY_RE = re.compile(rb'<([A-Za-z][\w-]*)\b[^<>]*>([^<>]*County[^<>]*)</(?i:\1)\s*>')
+
+# End of the page head; county mentions before it are never location text
+HEAD_END_RE = re.compile(rb'</head\s*>', re.IGNORECASE)
+
+# One whole site frequency cell in MHz, with a trailing 'c' marking control channels.
+# Cells with any other suffix (such as 'a' for alternate control channels) are skipped.
+FREQ_RE = re.compile(r'(\d+\.\d+)(c?)')
+
+# Account page that only answers 200 to a logged-in session (others are redirected to login)
+ACCOUNT_URL = 'https://www.radioreference.com/account/'
+
+# Text that only appears on RadioReference pages when logged in
+LOGGED_IN_RE = re.compile(rb'logout|sign out|my account', re.IGNORECASE)
+
+# Conditional-GET cache for RadioReference downloads (ETag/Last-Modified plus saved bodies)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'trunkrecorder')
+ETAG_CACHE_FILE = os.path.join(CACHE_DIR, 'etags.json')
+_etag_cache_lock = threading.Lock()
+
+# SHA-256 digests of the downloads behind the files last generated for each SID
+PROCESSED_FILE = os.path.join(CACHE_DIR, 'processed.json')
+
+def mhz_to_hz(freq_text):
+    """
+    Convert a decimal MHz string such as "851.012500" to integer Hz
+    
+    Uses integer arithmetic only, so there is no floating point rounding.
+    
+    Args:
+        freq_text (str): Frequency in MHz
+        
+    Returns:
+        int: Frequency in Hz
+        
+    Raises:
+        ValueError: If freq_text is not a decimal number
+    """
+    whole, _, fraction = freq_text.partition('.')
+    return int(whole or '0') * 1000000 + int((fraction + '000000')[:6])
+
+def calculate_recorders(device_index, center_freq, bandwidth, control_channels, total_devices=3):
     """
     Calculate the optimal number of digital recorders for each RTL-SDR device based on
-    the frequencies it can receive and the number of control channels in its range.
+    the number of control channels in its range.
     
     The number of digital recorders determines how many simultaneous calls can be
     recorded at the same time in the frequency range of this source.
@@ -35,8 +125,7 @@ def calculate_recorders(device_index, center_freq, bandwidth, all_frequencies, c
         device_index (int): Index of the current device
         center_freq (int): Center frequency of this RTL-SDR device in Hz
         bandwidth (int): Bandwidth of the RTL-SDR device in Hz
-        all_frequencies (list): All frequencies in the system in Hz
-        control_channels (list): Control channel frequencies in Hz
+        control_channels (tuple): Control channel frequencies in Hz, sorted ascending
         total_devices (int): Total number of RTL-SDR devices
         
     Returns:
@@ -46,13 +135,8 @@ def calculate_recorders(device_index, center_freq, bandwidth, all_frequencies, c
     lower_limit = center_freq - (bandwidth // 2)
     upper_limit = center_freq + (bandwidth // 2)
     
-    # Count frequencies and control channels in this device's range
-    freqs_in_range = [f for f in all_frequencies if lower_limit <= f <= upper_limit]
-    controls_in_range = [f for f in control_channels if lower_limit <= f <= upper_limit]
-    
-    # Base number of recorders on frequencies in range
-    freq_count = len(freqs_in_range)
-    control_count = len(controls_in_range)
+    # Count control channels in this device's range (the only count the allocation uses)
+    control_count = bisect_right(control_channels, upper_limit) - bisect_left(control_channels, lower_limit)
     
     # Calculate total recorders needed (aim for 36 total across all devices)
     total_recorders = 36
@@ -74,6 +158,143 @@ def calculate_recorders(device_index, center_freq, bandwidth, all_frequencies, c
     # Ensure reasonable limits (minimum 6, maximum 10)
     return max(6, min(10, recorders))
 
+def atomic_write_bytes(path, data):
+    """
+    Atomically write bytes to a file
+    
+    The data goes to a temporary file that is renamed over the target,
+    so an interrupted run never leaves a truncated file behind.
+    
+    Args:
+        path (str): Output file path
+        data (bytes): File contents
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Don't leave the temporary file behind when the write or rename fails
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def dump_json(obj, path):
+    """
+    Atomically write an object to a file as indented JSON
+    
+    Args:
+        obj: JSON-serializable object
+        path (str): Output file path
+    """
+    atomic_write_bytes(path, json_dumps(obj))
+
+def load_cache_file(path):
+    """
+    Load one of the JSON cache files kept under CACHE_DIR
+    
+    Args:
+        path (str): Cache file path
+        
+    Returns:
+        dict: Cached data, empty if the file does not exist yet or is unreadable
+    """
+    try:
+        with open(path, 'rb') as f:
+            return json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def cached_get(session, url):
+    """
+    Download a URL, reusing the body saved by a previous run when the server
+    reports it unchanged (HTTP 304) via ETag/Last-Modified validators
+    
+    Args:
+        session (requests.Session): Authenticated session
+        url (str): URL to download
+        
+    Returns:
+        bytes: Response body if successful, None if the download failed
+    """
+    entry = load_cache_file(ETAG_CACHE_FILE).get(url, {})
+    body_path = os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + '.body')
+    
+    # Only send validators when we still have the body they refer to
+    headers = {}
+    if os.path.exists(body_path):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    # Stream so the body is only transferred for a 200; 304s and error pages are never read
+    response = session.get(url, headers=headers, stream=True)
+    
+    if response.status_code == 304:
+        response.close()
+        try:
+            with open(body_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            # Cached body disappeared - fetch it again unconditionally
+            response = session.get(url, stream=True)
+    
+    if response.status_code != 200:
+        response.close()
+        return None
+    
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            atomic_write_bytes(body_path, response.content)
+            # Downloads may run concurrently - merge into the latest cache file
+            with _etag_cache_lock:
+                cache = load_cache_file(ETAG_CACHE_FILE)
+                cache[url] = {'etag': etag, 'last_modified': last_modified}
+                dump_json(cache, ETAG_CACHE_FILE)
+        except OSError:
+            pass  # Caching is best effort
+    
+    return response.content
+
+def download_digest(abbrev, siteid, *bodies):
+    """
+    Fingerprint the inputs that determine the generated talkgroup and site files
+    
+    Args:
+        abbrev (str): System abbreviation used in the talkgroup categories
+        siteid (str): Site ID requested with --siteid, None if not given
+        *bodies (bytes): Downloaded RadioReference CSV bodies
+        
+    Returns:
+        str: Combined SHA-256 hex digests
+    """
+    hashes = [hashlib.sha256(value.encode('utf-8')).hexdigest() for value in (abbrev, siteid or '')]
+    hashes.extend(hashlib.sha256(body).hexdigest() for body in bodies)
+    return ':'.join(hashes)
+
+def save_processed_digest(sid, digest):
+    """
+    Remember the download digest for the files just generated for a system
+    
+    Args:
+        sid (int): System ID number
+        digest (str): Digest from download_digest()
+    """
+    processed = load_cache_file(PROCESSED_FILE)
+    processed[str(sid)] = digest
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        dump_json(processed, PROCESSED_FILE)
+    except OSError:
+        pass  # Caching is best effort
+
 def login_radioreference(username, password):
     """
     Authenticate with RadioReference.com and establish a session
@@ -87,9 +308,15 @@ def login_radioreference(username, password):
     """
     session = requests.Session()
     session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept-Encoding': 'gzip, deflate'
     })
     
+    # Keep connections to RadioReference alive across requests and retry transient failures;
+    # once retries run out the last error response is returned and handled like any other
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries))
+    
     try:
         # Use the working login data
         login_data = {
@@ -99,11 +326,27 @@ def login_radioreference(username, password):
             'redirect': 'https://www.radioreference.com'
         }
         
-        # Submit login to the correct endpoint
-        response = session.post('https://www.radioreference.com/login/', data=login_data, allow_redirects=True)
+        # Submit login to the correct endpoint - only the session cookies matter, not the page.
+        # Redirects are still followed so cookies set along the chain are kept; stream=True
+        # means the final page body is never downloaded.
+        response = session.post('https://www.radioreference.com/login/', data=login_data, stream=True)
+        response.close()
         
-        # Check if login was successful by looking for logged-in indicators
-        if "logout" in response.text.lower() or "sign out" in response.text.lower() or "my account" in response.text.lower():
+        # Check if login was successful with a bodyless probe of the account page
+        probe = session.get(ACCOUNT_URL, allow_redirects=False, stream=True, timeout=5)
+        probe.close()
+        
+        if probe.is_redirect and urlsplit(probe.headers.get('Location', '')).path.startswith('/login'):
+            # Sent back to the login page
+            logged_in = False
+        elif probe.status_code == 200:
+            logged_in = True
+        else:
+            # Other redirect or unexpected status - fall back to looking for logged-in indicators
+            response = session.get('https://www.radioreference.com/')
+            logged_in = bool(LOGGED_IN_RE.search(response.content))
+        
+        if logged_in:
             print("✓ Successfully logged into RadioReference.com")
             return session
         else:
@@ -115,42 +358,95 @@ def login_radioreference(username, password):
         print(f"✗ Login error: {str(e)}")
         return None
 
-def get_system_info(session, sid):
+def download_system_data(session, sid, include_system_page=True):
     """
-    Fetch basic system information from RadioReference.com
+    Download the system page, talkgroups CSV and sites CSV concurrently
+    
+    The downloads are independent, so they share the pooled session and
+    overlap their network round trips.
     
     Args:
         session (requests.Session): Authenticated session
         sid (int): System ID number
+        include_system_page (bool): Also download the system page (skipped when already known)
         
     Returns:
-        dict: System information including name, location and ID if found, None if not found
+        tuple: (system page, talkgroups CSV, sites CSV) bodies as bytes, None for any that failed or was skipped
     """
-    site_url = f"https://www.radioreference.com/db/sid/{sid}"
-    response = session.get(site_url)
+    urls = [
+        f"https://www.radioreference.com/db/download/trs/tgs/?type=csv&sid={sid}",
+        f"https://www.radioreference.com/db/download/trs/sites/?type=csv&sid={sid}"
+    ]
+    if include_system_page:
+        urls.insert(0, f"https://www.radioreference.com/db/sid/{sid}")
     
-    if response.status_code != 200:
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        bodies = tuple(executor.map(lambda url: cached_get(session, url), urls))
+    
+    return bodies if include_system_page else (None,) + bodies
+
+def get_system_info(content, sid):
+    """
+    Extract basic system information from a RadioReference.com system page
+    
+    Args:
+        content (bytes): System page HTML, None if the download failed
+        sid (int): System ID number
+        
+    Returns:
+        dict: System information including name, location and ID if found, None if not found
+    """
+    if content is None:
         return None
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    # Read the page title and location straight from the bytes; only parse as HTML if that fails
+    title_match = TITLE_RE.search(content)
+    
+    # The byte-level match is only used when it holds the first 'County' in the page body and is
+    # ordinary text (not inside a hidden element), i.e. the same string the HTML fallback would pick
+    location = None
+    head_end = HEAD_END_RE.search(content)
+    body_start = head_end.end() if head_end else (title_match.end() if title_match else 0)
+    county_match = COUNTY_RE.search(content, body_start)
+    if (county_match and county_match.start(2) <= content.find(b'County', body_start) < county_match.end(2)
+            and county_match.group(1).lower().decode('ascii') not in HIDDEN_TEXT_TAGS):
+        text = html.unescape(county_match.group(2).decode('utf-8', 'replace')).strip()
+        if len(text) < 50:
+            location = text
+    
+    soup = None
+    if not title_match or location is None:
+        # bs4 is only needed for this fallback, so it is not imported on the fast path
+        from bs4 import BeautifulSoup, Comment
+        
+        # County text can sit in any element, so the whole page is parsed
+        soup = BeautifulSoup(content, HTML_PARSER)
     
     # Try to find system name from page title
-    title = soup.find('title')
+    if title_match:
+        title_text = html.unescape(title_match.group(1).decode('utf-8', 'replace')).strip()
+    else:
+        title = soup.find('title')
+        title_text = title.text.strip() if title else ''
     system_name = "Unknown System"
     
-    if title:
-        title_text = title.text.strip()
+    if title_text:
         if 'Trunked Radio System' in title_text:
             system_name = title_text.replace('Trunked Radio System', '').strip()
         elif 'Radio System' in title_text:
             system_name = title_text.replace('Radio System', '').strip()
     
-    # Try to find location/county info in page text
-    location = "Unknown Location"
-    for text in soup.find_all(string=True):
-        if 'County' in str(text) and len(str(text).strip()) < 50:
-            location = str(text).strip()
-            break
+    # Fall back to the first short visible text string mentioning a county
+    if location is None:
+        location = "Unknown Location"
+        for string in soup.find_all(string=lambda text: 'County' in text):
+            if isinstance(string, Comment) or string.parent.name in HIDDEN_TEXT_TAGS:
+                continue  # Page title or non-visible text
+            
+            text = string.strip()
+            if len(text) < 50:
+                location = text
+                break
     
     return {
         'name': system_name,
@@ -158,12 +454,13 @@ def get_system_info(session, sid):
         'sid': sid
     }
 
-def fetch_system_data(session, sid, siteid=None):
+def fetch_system_data(tg_csv, sites_csv, sid, siteid=None):
     """
-    Download and parse system data including talkgroups and site information
+    Parse system data including talkgroups and site information
     
     Args:
-        session (requests.Session): Authenticated session
+        tg_csv (bytes): Talkgroups CSV body, None if the download failed
+        sites_csv (bytes): Sites CSV body, None if the download failed
         sid (int): System ID number
         siteid (str, optional): Specific site ID to use
         
@@ -171,57 +468,31 @@ def fetch_system_data(session, sid, siteid=None):
         tuple: (talkgroups list, system_info dict) if successful, (None, None) if failed
     """
     
-    # Download talkgroups CSV
-    tg_csv_url = f"https://www.radioreference.com/db/download/trs/tgs/?type=csv&sid={sid}"
-    response = session.get(tg_csv_url)
-    
-    if response.status_code != 200:
+    if tg_csv is None:
         print(f"✗ Failed to download talkgroups CSV for SID {sid}")
         return None, None
     
-    # Parse talkgroups CSV
-    talkgroups = []
-    lines = response.text.strip().split('\n')
-    
-    if len(lines) > 1:  # Skip header
-        reader = csv.reader(lines[1:])  # Skip header row
-        for row in reader:
-            if len(row) >= 4:
-                dec_id = row[0].strip()
-                hex_id = row[1].strip() if len(row) > 1 else ''
-                alpha_tag = row[2].strip() if len(row) > 2 else ''
-                description = row[3].strip() if len(row) > 3 else ''
-                
-                if dec_id.isdigit():
-                    talkgroups.append([dec_id, hex_id, alpha_tag, 'T', description, 'Fire/EMS', 'Fire/EMS'])
+    # Parse talkgroups CSV line by line
+    reader = csv.reader(io.StringIO(tg_csv.decode('utf-8', 'replace')))
+    next(reader, None)  # Skip header row
     
-    # Download sites CSV
-    sites_csv_url = f"https://www.radioreference.com/db/download/trs/sites/?type=csv&sid={sid}"
-    response = session.get(sites_csv_url)
+    # Rows with at least the four leading columns, stripped
+    fields = ([col.strip() for col in row[:4]] for row in reader if len(row) >= 4)
+    talkgroups = [(dec_id, hex_id, alpha_tag, 'T', description, 'Fire/EMS', 'Fire/EMS')
+                  for dec_id, hex_id, alpha_tag, description in fields if dec_id.isdigit()]
     
-    if response.status_code != 200:
+    if sites_csv is None:
         print(f"✗ Failed to download sites CSV for SID {sid}")
         return talkgroups, None
     
     # Parse sites CSV and let user select site
-    lines = response.text.strip().split('\n')
-    sites = []
-    
-    if len(lines) > 1:  # Skip header
-        reader = csv.reader(lines[1:])  # Skip header row
-        for row in reader:
-            if len(row) >= 10:  # Ensure we have enough columns
-                site_dec = row[1].strip() if len(row) > 1 else ''
-                site_desc = row[2].strip() if len(row) > 2 else 'Unknown Site'
-                site_nac = row[3].strip() if len(row) > 3 else ''
-                
-                if site_dec:
-                    sites.append({
-                        'dec': site_dec,
-                        'description': site_desc,
-                        'nac': site_nac,
-                        'row': row
-                    })
+    reader = csv.reader(io.StringIO(sites_csv.decode('utf-8', 'replace')))
+    next(reader, None)  # Skip header row
+    
+    # Rows with enough columns; sites without a decimal ID are dropped
+    candidates = (Site(*[col.strip() for col in row[1:4]], row[4:9], row[9:])
+                  for row in reader if len(row) >= 10)
+    sites = [site for site in candidates if site.dec]
     
     if not sites:
         print(f"✗ No sites found for SID {sid}")
@@ -233,28 +504,32 @@ def fetch_system_data(session, sid, siteid=None):
     if siteid:
         # Use provided site ID (for automated updates)
         for site in sites:
-            if site['dec'] == siteid:
+            if site.dec == siteid:
                 selected_site = site
-                print(f"Using specified site: {selected_site['description']} (ID: {selected_site['dec']})")
+                print(f"Using specified site: {selected_site.description} (ID: {selected_site.dec})")
                 break
         if not selected_site:
             print(f"✗ Site ID {siteid} not found, using first available site")
             selected_site = sites[0]
     elif len(sites) == 1:
         selected_site = sites[0]
-        print(f"Using site: {selected_site['description']} (ID: {selected_site['dec']})")
+        print(f"Using site: {selected_site.description} (ID: {selected_site.dec})")
     else:
-        print(f"\n📍 Multiple sites found:")
-        print(f"{'#':<3} {'ID':<6} {'Description':<30} {'NAC':<6} {'Additional Info':<50}")
-        print("-" * 95)
+        lines = [
+            f"\n📍 Multiple sites found:",
+            f"{'#':<3} {'ID':<6} {'Description':<30} {'NAC':<6} {'Additional Info':<50}",
+            "-" * 95
+        ]
         for i, site in enumerate(sites):
             # Get additional info from remaining columns
-            row = site['row']
-            additional_info = ' | '.join([col.strip() for col in row[4:9] if col.strip()])
+            additional_info = ' | '.join([col.strip() for col in site.info if col.strip()])
             if len(additional_info) > 47:
                 additional_info = additional_info[:47] + "..."
             
-            print(f"{i+1:<3} {site['dec']:<6} {site['description']:<30} {site['nac']:<6} {additional_info:<50}")
+            lines.append(f"{i+1:<3} {site.dec:<6} {site.description:<30} {site.nac:<6} {additional_info:<50}")
+        
+        # Print the whole site table with a single write
+        sys.stdout.write("\n".join(lines) + "\n")
         
         while True:
             try:
@@ -274,29 +549,20 @@ def fetch_system_data(session, sid, siteid=None):
         'frequencies': [],
         'nac': None,
         'name': None,
-        'siteid': selected_site['dec']
+        'siteid': selected_site.dec
     }
     
     # Extract NAC (Network Access Code)
-    if selected_site['nac']:
-        system_info['nac'] = f"0x{selected_site['nac']}"
+    if selected_site.nac:
+        system_info['nac'] = f"0x{selected_site.nac}"
     
     # Extract frequencies from selected site row
-    row = selected_site['row']
-    for i in range(9, len(row)):
-        freq_text = row[i].strip()
-        if freq_text and '.' in freq_text:
-            try:
-                if freq_text.endswith('c'):  # Control channel
-                    freq = freq_text.replace('c', '')
-                    freq_hz = int(float(freq) * 1000000)
-                    system_info['control_channels'].append(freq_hz)
-                    system_info['frequencies'].append(freq_hz)
-                else:  # Regular frequency
-                    freq_hz = int(float(freq_text) * 1000000)
-                    system_info['frequencies'].append(freq_hz)
-            except:
-                pass
+    cell_matches = [FREQ_RE.fullmatch(cell.strip()) for cell in selected_site.freqs]
+    matches = [match.groups() for match in cell_matches if match]
+    frequencies = [mhz_to_hz(freq_text) for freq_text, _ in matches]
+    system_info['frequencies'] = frequencies
+    system_info['control_channels'] = [freq_hz for freq_hz, (_, control_flag) in zip(frequencies, matches)
+                                       if control_flag]
     
     return talkgroups, system_info
 
@@ -305,15 +571,15 @@ def display_frequency_graph(freqs, centers, bandwidth=2400000):
     Display a visual graph of frequency distribution across RTL devices
     
     Args:
-        freqs (list): All frequencies in Hz
+        freqs (list): All frequencies in Hz, sorted ascending
         centers (list): RTL center frequencies in Hz  
         bandwidth (int): RTL bandwidth in Hz
     """
     print("\n📊 RTL-SDR Frequency Distribution")
     print("=" * 50)
     
-    min_freq = min(freqs) / 1000000
-    max_freq = max(freqs) / 1000000
+    min_freq = freqs[0] / 1000000
+    max_freq = freqs[-1] / 1000000
     span = max_freq - min_freq
     
     # Create frequency scale
@@ -324,58 +590,58 @@ def display_frequency_graph(freqs, centers, bandwidth=2400000):
     print(f"\nFrequency Range: {min_freq:.3f} - {max_freq:.3f} MHz (Span: {span:.3f} MHz)\n")
     
     # Draw scale
-    scale_line = ""
-    for i in range(scale_width + 1):
-        freq_pos = scale_start + (scale_end - scale_start) * i / scale_width
-        if i % 10 == 0:
-            scale_line += "|"
-        else:
-            scale_line += "-"
+    scale_line = "".join("|" if i % 10 == 0 else "-" for i in range(scale_width + 1))
     print(f"{scale_start:3.0f}" + scale_line[3:-3] + f"{scale_end:3.0f} MHz")
     
+    # Scale span, and the position of every frequency, computed once for all devices
+    scale_span = scale_end - scale_start
+    freq_positions = [int((freq / 1000000 - scale_start) / scale_span * scale_width) for freq in freqs]
+    bw_mhz = bandwidth / 1000000 / 2  # Half bandwidth each side
+    
     # Draw RTL coverage for each device
     for i, center in enumerate(centers):
         center_mhz = center / 1000000
-        bw_mhz = bandwidth / 1000000 / 2  # Half bandwidth each side
         
         # Calculate positions on scale
-        center_pos = int((center_mhz - scale_start) / (scale_end - scale_start) * scale_width)
-        start_pos = int((center_mhz - bw_mhz - scale_start) / (scale_end - scale_start) * scale_width)
-        end_pos = int((center_mhz + bw_mhz - scale_start) / (scale_end - scale_start) * scale_width)
+        center_pos = int((center_mhz - scale_start) / scale_span * scale_width)
+        start_pos = int((center_mhz - bw_mhz - scale_start) / scale_span * scale_width)
+        end_pos = int((center_mhz + bw_mhz - scale_start) / scale_span * scale_width)
         
         # Create RTL coverage line
         rtl_line = [" "] * (scale_width + 1)
         
         # Mark coverage range
-        for pos in range(max(0, start_pos), min(scale_width + 1, end_pos + 1)):
-            rtl_line[pos] = "═"
+        cover_start = max(0, start_pos)
+        cover_end = min(scale_width + 1, end_pos + 1)
+        if cover_end > cover_start:
+            rtl_line[cover_start:cover_end] = "═" * (cover_end - cover_start)
         
         # Mark center
         if 0 <= center_pos <= scale_width:
             rtl_line[center_pos] = "█"
         
         # Mark frequencies in this RTL's range
-        for freq in freqs:
-            freq_mhz = freq / 1000000
-            if center_mhz - bw_mhz <= freq_mhz <= center_mhz + bw_mhz:
-                freq_pos = int((freq_mhz - scale_start) / (scale_end - scale_start) * scale_width)
-                if 0 <= freq_pos <= scale_width and rtl_line[freq_pos] != "█":
-                    rtl_line[freq_pos] = "●"
+        lo = bisect_left(freqs, center - bandwidth // 2)
+        hi = bisect_right(freqs, center + bandwidth // 2)
+        for freq_pos in freq_positions[lo:hi]:
+            if 0 <= freq_pos <= scale_width and rtl_line[freq_pos] != "█":
+                rtl_line[freq_pos] = "●"
         
         rtl_display = "".join(rtl_line)
-        freq_count = sum(1 for f in freqs if center_mhz - bw_mhz <= f/1000000 <= center_mhz + bw_mhz)
+        freq_count = hi - lo
         
         print(f"RTL={i} [{center_mhz:7.3f} MHz]: {rtl_display} ({freq_count} freqs)")
     
     print("\nLegend: █ = RTL Center  ● = Frequency  ═ = Coverage Range")
     print(f"Each RTL covers ±{bandwidth/2000000:.1f} MHz from center frequency\n")
 
-def generate_config(system_info, shortname="system", upload_config=None):
+def generate_config(system_info, freqs, shortname="system", upload_config=None):
     """
     Generate trunk-recorder config.json structure
     
     Args:
         system_info (dict): System information including frequencies
+        freqs (list): The system's frequencies in Hz, sorted ascending
         shortname (str): Short name identifier for the system
         upload_config (dict): Upload service configuration settings
         
@@ -383,14 +649,14 @@ def generate_config(system_info, shortname="system", upload_config=None):
         dict: Complete config.json structure if successful, None if failed
     """
     
-    if not system_info['frequencies']:
+    if not freqs:
         print("✗ No frequencies found")
         return None
     
     # Calculate optimal RTL-SDR center frequencies with improved distribution
-    freqs = sorted(system_info['frequencies'])
-    min_freq = min(freqs)
-    max_freq = max(freqs)
+    # Sorted once and frozen so every device's bisect lookups share it
+    control_channels = tuple(sorted(system_info['control_channels']))
+    min_freq, max_freq = freqs[0], freqs[-1]
     span = max_freq - min_freq
     
     # Calculate number of sources needed (2.4MHz bandwidth per RTL-SDR)
@@ -410,13 +676,11 @@ def generate_config(system_info, shortname="system", upload_config=None):
         group_size = freqs_per_rtl + (1 if i < remainder else 0)
         end_idx = start_idx + group_size
         
-        # Get frequency group for this RTL
-        freq_group = freqs[start_idx:end_idx]
-        
         # Calculate optimal center frequency for this group
-        if freq_group:
-            group_min = min(freq_group)
-            group_max = max(freq_group)
+        # (freqs is sorted, so the group's edges are its first and last entries)
+        if end_idx > start_idx:
+            group_min = freqs[start_idx]
+            group_max = freqs[end_idx - 1]
             center = (group_min + group_max) // 2
         else:
             # Fallback to original method if no frequencies in group
@@ -437,7 +701,7 @@ def generate_config(system_info, shortname="system", upload_config=None):
             "ppm": 0,
             "gain": 49,
             "agc": False,
-            "digitalRecorders": calculate_recorders(i, center, bandwidth, freqs, system_info['control_channels'], num_sources),
+            "digitalRecorders": calculate_recorders(i, center, bandwidth, control_channels, num_sources),
             "analogRecorders": 0,
             "driver": "osmosdr",
             "device": f"rtl={i}"
@@ -512,10 +776,13 @@ def generate_config(system_info, shortname="system", upload_config=None):
     
     return config
 
+@lru_cache(maxsize=1)
 def load_existing_config():
     """
     Load existing config.json if present (for upload service defaults)
     
+    The result is cached and must be treated as read-only.
+    
     Returns:
         dict: Existing configuration if found, None if not found
     """
@@ -524,10 +791,38 @@ def load_existing_config():
     
     for config_path in config_paths:
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        except:
+            with open(config_path, 'rb') as f:
+                data = f.read()
+            return json_loads(data)
+        except (OSError, ValueError):  # Missing/unreadable file or invalid JSON
+            continue
+    return None
+
+def load_saved_system_info(sid):
+    """
+    Load the system name and location recorded in siteinfo.json by a previous run
+    
+    Args:
+        sid (int): System ID number the saved information must belong to
+        
+    Returns:
+        dict: System information including name, location and ID if found, None if not found
+    """
+    # Same locations main() saves siteinfo.json to
+    siteinfo_paths = ['/etc/trunk-recorder/siteinfo.json', 'siteinfo.json']
+    
+    for path in siteinfo_paths:
+        try:
+            with open(path, 'rb') as f:
+                site_info = json_loads(f.read())
+        except (OSError, ValueError):
             continue
+        if site_info.get('sid') == sid and site_info.get('system_name'):
+            return {
+                'name': site_info['system_name'],
+                'location': site_info.get('system_location', 'Unknown Location'),
+                'sid': sid
+            }
     return None
 
 def get_upload_config(system_shortname=None):
@@ -670,7 +965,7 @@ def main():
     parser.add_argument('password', help='RadioReference.com password')
     parser.add_argument('sid', type=int, help='System ID (from URL like /db/sid/12059)')
     parser.add_argument('--shortname', default='system', help='Short name for system')
-    parser.add_argument('--abbrev', default='SYSTEM', help='System abbreviation for categories')
+    parser.add_argument('--abbrev', default='SYSTEM', type=str.upper, help='System abbreviation for categories')
     parser.add_argument('--siteid', help='Specific site ID to use (for automated updates)')
     parser.add_argument('--update-only', action='store_true', help='Only update talkgroups, skip configuration prompts')
     parser.add_argument('--capture-siteid', action='store_true', help='Save selected siteid to file for future updates')
@@ -684,9 +979,16 @@ def main():
     if not session:
         sys.exit(1)
     
-    # Get basic system info for verification
+    # Scheduled updates reuse the system name saved by the last run instead of fetching the system page
     print(f"\nLooking up system information for SID {args.sid}...")
-    basic_info = get_system_info(session, args.sid)
+    basic_info = load_saved_system_info(args.sid) if args.update_only else None
+    
+    # Download everything else we need from RadioReference up front
+    system_page, tg_csv, sites_csv = download_system_data(session, args.sid, include_system_page=basic_info is None)
+    
+    # Get basic system info for verification
+    if basic_info is None:
+        basic_info = get_system_info(system_page, args.sid)
     
     if not basic_info:
         print(f"✗ Could not find system with SID {args.sid}")
@@ -705,22 +1007,34 @@ def main():
     else:
         print(f"\n✓ Updating system: {basic_info['name']}")
     
+    # Scheduled updates can stop here if RadioReference data has not changed since the last run
+    digest = None
+    if tg_csv is not None and sites_csv is not None:
+        digest = download_digest(args.abbrev, args.siteid, tg_csv, sites_csv)
+        # --capture-siteid must reach the code below that writes siteid.txt
+        if (args.update_only and not args.capture_siteid and os.path.exists('talkgroup.csv')
+                and load_cache_file(PROCESSED_FILE).get(str(args.sid)) == digest):
+            print("\n✓ Talkgroup and site data unchanged since last update - files are current")
+            sys.exit(0)
+    
     # Fetch detailed system data to calculate RTL-SDR requirements
     if not args.update_only:
         print(f"\nAnalyzing frequency requirements...")
     else:
         print(f"\nFetching talkgroup data...")
         
-    talkgroups, system_info = fetch_system_data(session, args.sid, args.siteid)
+    talkgroups, system_info = fetch_system_data(tg_csv, sites_csv, args.sid, args.siteid)
+    
+    # Sort the site frequencies once; their bounds are then the first and last entries
+    freqs = sorted(system_info['frequencies']) if system_info else []
     
-    if not args.update_only and system_info and system_info['frequencies']:
-        freqs = sorted(system_info['frequencies'])
-        min_freq = min(freqs) / 1000000
-        max_freq = max(freqs) / 1000000
+    if not args.update_only and freqs:
+        min_freq = freqs[0] / 1000000
+        max_freq = freqs[-1] / 1000000
         span = max_freq - min_freq
         
-        # Calculate RTL-SDR requirements (2.4MHz bandwidth each)
-        rtl_needed = max(1, int((span / 2.4) + 1))
+        # Calculate RTL-SDR requirements (2.4MHz bandwidth each), in integer Hz
+        rtl_needed = max(1, (freqs[-1] - freqs[0]) * 10 // 24000000 + 1)
         
         print(f"\n📻 RTL-SDR Requirements:")
         print(f"   Frequency range: {min_freq:.3f} - {max_freq:.3f} MHz")
@@ -732,10 +1046,13 @@ def main():
     # Get upload service configuration (skip if update-only)
     if args.update_only:
         upload_config = None
+        uploads_enabled = False
         print("\nSkipping upload service configuration (update-only mode)")
     else:
         input("\nPress Enter to continue with configuration...")
         upload_config = get_upload_config(args.shortname)
+        uploads_enabled = (upload_config['broadcastify']['enabled'] or upload_config['openmhz']['enabled']
+                           or upload_config['rdio']['enabled'])
     
     # System data already fetched above
     if not args.update_only:
@@ -751,41 +1068,55 @@ def main():
         print("✗ No system info found")
         sys.exit(1)
     
-    # Get raw RadioReference CSV for saving
-    tg_csv_url = f"https://www.radioreference.com/db/download/trs/tgs/?type=csv&sid={args.sid}"
-    tg_response = session.get(tg_csv_url)
-    
-    if tg_response.status_code == 200:
-        lines = tg_response.text.strip().split('\n')
+    # Reuse the raw RadioReference CSV downloaded above for saving
+    if tg_csv is not None:
+        # Parse the CSV once; every output file is written from the same pass over the rows
+        tg_text = tg_csv.decode('utf-8', 'replace').strip()
+        rows = list(csv.reader(io.StringIO(tg_text)))
+        
+        # Without any quote characters no field can contain a delimiter or line break,
+        # so rows can be joined directly instead of going through csv.writer
+        plain_rows = '"' not in tg_text and not CSV_QUOTE_RE.search(args.abbrev)
         
         # Process CSV to append system abbreviation to category
-        def process_csv_with_system_abbrev(filename, truncate_desc=False):
-            with open(filename, 'w', newline='') as f:
-                writer = csv.writer(f)
+        def process_csv_with_system_abbrev(outputs):
+            abbrev_upper = args.abbrev  # Upper-cased by argparse
+            prefix = abbrev_upper + " - "
+            
+            for row in rows[1:]:  # Data rows
+                if len(row) >= 7:  # Ensure we have category column (index 6)
+                    # Prepend system abbreviation to category (column 6)
+                    category = row[6]
+                    row[6] = prefix + category if category and not category.isspace() else abbrev_upper
+            
+            def truncated_rows():
+                yield from rows[:1]  # Header row
+                for row in rows[1:]:
+                    # Truncate description for OpenMHz; rows that already fit are shared as-is
+                    if len(row) >= 5 and len(row[4]) > 25:
+                        new_desc = row[4][:25]
+                        row = row.copy()
+                        row[4] = new_desc
+                    yield row
+            
+            def serialize(row_iter):
+                if plain_rows:
+                    return ''.join([','.join(row) + '\r\n' for row in row_iter]).encode('utf-8')
                 
-                for i, line in enumerate(lines):
-                    row = list(csv.reader([line]))[0]  # Parse each line individually
-                    
-                    if i == 0:  # Header row
-                        writer.writerow(row)
-                    else:  # Data rows
-                        if len(row) >= 7:  # Ensure we have category column (index 6)
-                            # Prepend system abbreviation to category (column 6)
-                            if row[6].strip():
-                                row[6] = f"{args.abbrev.upper()} - {row[6]}"
-                            else:
-                                row[6] = args.abbrev.upper()
-                        
-                        if truncate_desc and len(row) >= 5:  # Truncate description for OpenMHz
-                            row[4] = row[4][:25] if len(row[4]) > 25 else row[4]
-                        
-                        writer.writerow(row)
+                buf = io.StringIO(newline='')
+                csv.writer(buf).writerows(row_iter)
+                return buf.getvalue().encode('utf-8')
+            
+            # Files with full descriptions share one serialized copy
+            full = serialize(rows)
+            for filename, truncate_desc in outputs:
+                atomic_write_bytes(filename, serialize(truncated_rows()) if truncate_desc else full)
         
         # Generate all three CSV files with system abbreviation appended to category
-        process_csv_with_system_abbrev('talkgroup.csv')
+        outputs = [('talkgroup.csv', False)]
         if not args.update_only:  # Only generate additional formats during full deployment
-            process_csv_with_system_abbrev('talkgroup-rdio.csv')
-            process_csv_with_system_abbrev('talkgroup-openmhz.csv', truncate_desc=True)
+            outputs += [('talkgroup-rdio.csv', False), ('talkgroup-openmhz.csv', True)]
+        process_csv_with_system_abbrev(outputs)
     
     print(f"✓ Found {len(talkgroups)} talkgroups")
     
@@ -800,6 +1131,9 @@ def main():
     
     # Save site information to siteinfo.json
     if system_info:
+        # Frequency bounds shared by the range and RTL-SDR estimate
+        lo, hi = (freqs[0], freqs[-1]) if freqs else (0, 0)
+        
         site_info = {
             'system_name': basic_info['name'],
             'system_location': basic_info['location'],
@@ -809,61 +1143,77 @@ def main():
             'control_channels': system_info['control_channels'],
             'all_frequencies': system_info['frequencies'],
             'frequency_range': {
-                'min_mhz': min(system_info['frequencies']) / 1000000 if system_info['frequencies'] else 0,
-                'max_mhz': max(system_info['frequencies']) / 1000000 if system_info['frequencies'] else 0,
-                'span_mhz': (max(system_info['frequencies']) - min(system_info['frequencies'])) / 1000000 if system_info['frequencies'] else 0
+                'min_mhz': lo / 1000000 if freqs else 0,
+                'max_mhz': hi / 1000000 if freqs else 0,
+                'span_mhz': (hi - lo) / 1000000 if freqs else 0
             },
-            'rtl_sdr_count': max(1, int(((max(system_info['frequencies']) - min(system_info['frequencies'])) / 1000000 / 2.4) + 1)) if system_info['frequencies'] else 1
+            'rtl_sdr_count': max(1, (hi - lo) * 10 // 24000000 + 1) if freqs else 1
         }
         
         # Try to save to /etc/trunk-recorder/ first, fallback to current directory
         siteinfo_paths = ['/etc/trunk-recorder/siteinfo.json', 'siteinfo.json']
         
-        for path in siteinfo_paths:
+        # Skip locations whose directory is not writable instead of catching PermissionError,
+        # but still move on to the next location if writing fails for any other reason
+        writable_paths = [path for path in siteinfo_paths
+                          if os.access(os.path.dirname(path) or '.', os.W_OK)]
+        error = None
+        
+        for path in writable_paths:
             try:
-                with open(path, 'w') as f:
-                    json.dump(site_info, f, indent=2)
+                dump_json(site_info, path)
                 print(f"✓ Site information saved to {path}")
                 break
-            except PermissionError:
-                if path == siteinfo_paths[-1]:  # Last attempt failed
-                    print(f"✗ Could not save site information to any location")
             except Exception as e:
-                if path == siteinfo_paths[-1]:  # Last attempt failed
-                    print(f"✗ Error saving site information: {e}")
+                error = e
+        else:  # Every attempt failed
+            if error is None or isinstance(error, PermissionError):
+                print(f"✗ Could not save site information to any location")
+            else:
+                print(f"✗ Error saving site information: {error}")
     
     # Generate config.json (skip if update-only)
     if not args.update_only:
-        config = generate_config(system_info, args.shortname, upload_config)
+        config = generate_config(system_info, freqs, args.shortname, upload_config)
         if config:
             print(f"✓ Found {len(system_info['control_channels'])} control channels")
             print(f"✓ Found {len(system_info['frequencies'])} total frequencies")
             print(f"✓ Generated {len(config['sources'])} RTL-SDR sources")
             
-            with open('config.json', 'w') as f:
-                json.dump(config, f, indent=2)
+            dump_json(config, 'config.json')
             
-            print("\n✓ Files generated:")
-            print("  - config.json")
-            print("  - talkgroup.csv (full descriptions)")
-            print("  - talkgroup-openmhz.csv (25-char descriptions)")
-            print("  - talkgroup-rdio.csv (original RadioReference format)")
-            print("  - siteinfo.json (site and frequency information)")
-            print("\n📋 Note: talkgroup-rdio.csv can be imported into RDIOScanner admin site")
+            summary = [
+                "\n✓ Files generated:",
+                "  - config.json",
+                "  - talkgroup.csv (full descriptions)",
+                "  - talkgroup-openmhz.csv (25-char descriptions)",
+                "  - talkgroup-rdio.csv (original RadioReference format)",
+                "  - siteinfo.json (site and frequency information)",
+                "\n📋 Note: talkgroup-rdio.csv can be imported into RDIOScanner admin site",
+            ]
             
-            if not any(upload_config[svc]['enabled'] for svc in upload_config):
-                print("\n⚠ No upload services configured - recordings will be local only")
+            if not uploads_enabled:
+                summary.append("\n⚠ No upload services configured - recordings will be local only")
             else:
-                print("\n✓ Upload services configured successfully!")
+                summary.append("\n✓ Upload services configured successfully!")
+            
+            # Emit the summary block with a single write
+            sys.stdout.write("\n".join(summary) + "\n")
         else:
             print("✗ Failed to generate config")
             sys.exit(1)
     else:
-        print("\n✓ Files updated:")
-        print("  - talkgroup.csv (full descriptions)")
-        print("  - talkgroup-openmhz.csv (25-char descriptions)")
-        print("  - talkgroup-rdio.csv (original RadioReference format)")
-        print("  - siteinfo.json (site and frequency information)")
+        sys.stdout.write("\n✓ Files updated:\n"
+                         "  - talkgroup.csv (full descriptions)\n"
+                         "  - talkgroup-openmhz.csv (25-char descriptions)\n"
+                         "  - talkgroup-rdio.csv (original RadioReference format)\n"
+                         "  - siteinfo.json (site and frequency information)\n")
+    
+    if digest:
+        save_processed_digest(args.sid, digest)
+    
+    # Flush every file written above to disk with a single sync
+    os.sync()
 
 if __name__ == "__main__":
     main()
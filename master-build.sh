@@ -92,7 +92,7 @@ echo
 # Install required Python packages for the RadioReference scraper
 echo "📦 Installing required Python packages..."
 safe_apt update
-safe_apt install -y python3-requests python3-bs4
+safe_apt install -y python3-requests python3-bs4 python3-lxml
 
 # Create service user and group if they don't exist
 echo "Creating trunkrecorder user and group..."